@@ -1,9 +1,8 @@
-from dataclasses import dataclass
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Optional
 
-import pendulum
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, sql
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, sql
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from idlemax.experience_to_level import xp_to_level
@@ -18,7 +17,9 @@ class TimestampMixin:
     """
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=sql.func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=sql.func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=sql.func.now(), onupdate=sql.func.now()
+    )
 
 
 class Base(DeclarativeBase):
@@ -158,6 +159,7 @@ class CharacterItem(TimestampMixin, Base):
     """
 
     __tablename__ = "character_items"
+    __table_args__ = (Index("ix_character_items_character_id_item_id", "character_id", "item_id"),)
 
     character_item_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     character_id: Mapped[int] = mapped_column(ForeignKey("characters.character_id"))
@@ -201,7 +203,7 @@ class CharacterActivity(TimestampMixin, Base):
     character: Mapped["Character"] = relationship("Character")
 
     def __str__(self) -> str:
-        return f"""{self.activity.activity_name}\n            \tStart Time: {self.started_at} ({pendulum.instance(self.started_at).diff_for_humans()})\
+        return f"""{self.activity.activity_name}\n            \tStart Time: {self.started_at} ({humanize(self.started_at)})\
         """
 
 
@@ -255,6 +257,7 @@ class CharacterSkill(TimestampMixin, Base):
     """
 
     __tablename__ = "character_skills"
+    __table_args__ = (Index("ix_character_skills_character_id_activity_id", "character_id", "activity_id"),)
 
     character_skill_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     character_id: Mapped[int] = mapped_column(ForeignKey("characters.character_id"))
@@ -277,6 +280,9 @@ class CharacterSkill(TimestampMixin, Base):
 def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
     """Ensure a datetime is timezone-aware in UTC.
 
+    SQLite hands back naive UTC datetimes, which are tagged with the UTC timezone directly. Aware datetimes are
+    converted to UTC.
+
     Args:
         dt (Optional[datetime]): The datetime to convert, or None
 
@@ -285,19 +291,65 @@ def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
 
     Examples:
         >>> ensure_utc(datetime(2025, 1, 1))  # naive datetime
-        DateTime(2025, 1, 1, 0, 0, 0, tzinfo=+00:00)
+        datetime.datetime(2025, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)
         >>> ensure_utc(None)
         None
     """
     if dt is None:
         return None
     if dt.tzinfo is None:
-        return pendulum.instance(dt, tz="UTC")
-    return dt
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+# Unit lengths in seconds, largest first. Months and years are counted in days, as Pendulum does, rather than
+# built up from weeks.
+_HUMANIZE_UNITS: list[tuple[int, str]] = [
+    (365 * 24 * 60 * 60, "year"),
+    (30 * 24 * 60 * 60, "month"),
+    (7 * 24 * 60 * 60, "week"),
+    (24 * 60 * 60, "day"),
+    (60 * 60, "hour"),
+    (60, "minute"),
+    (1, "second"),
+]
+
+
+def humanize(dt: datetime) -> str:
+    """Describe how long ago (or how far ahead) a datetime is, relative to now.
+
+    A lightweight stand-in for Pendulum's `diff_for_humans`, used on display paths
+    that render many timestamps. Naive datetimes are treated as UTC.
+
+    Args:
+        dt (datetime): The datetime to describe
+
+    Returns:
+        str: A phrase such as "5 minutes ago" or "in 2 hours"
+
+    Examples:
+        >>> humanize(datetime.now(timezone.utc))
+        'a few seconds ago'
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    seconds = time.time() - dt.timestamp()
+    is_future = seconds < 0
+    count = abs(seconds)
+    if count < 10:
+        return "in a few seconds" if is_future else "a few seconds ago"
+
+    for size, unit in _HUMANIZE_UNITS:
+        if count >= size:
+            break
+    count = int(count // size)
+    phrase = f"{count} {unit}" if count == 1 else f"{count} {unit}s"
+    return f"in {phrase}" if is_future else f"{phrase} ago"
 
 
 class CharacterActivityHistory(TimestampMixin, Base):
     __tablename__ = "character_activity_history"
+    __table_args__ = (Index("ix_character_activity_history_character_id", "character_id"),)
 
     character_activity_history_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     character_id: Mapped[int] = mapped_column(ForeignKey("characters.character_id"))
@@ -314,9 +366,6 @@ class CharacterActivityHistory(TimestampMixin, Base):
         "CharacterActivityExperienceReward", uselist=True
     )
     item_costs: Mapped[list["CharacterActivityItemCost"]] = relationship("CharacterActivityItemCost", uselist=True)
-    experience_rewards: Mapped[list["CharacterActivityExperienceReward"]] = relationship(
-        "CharacterActivityExperienceReward", uselist=True
-    )
 
 
 class CharacterActivityItemReward(TimestampMixin, Base):
@@ -2,6 +2,7 @@ import click
 import questionary
 from questionary import Style
 
+from idlemax.character import humanize
 from idlemax.game import Game
 
 DEFAULT_DB_PATH = "sqlite:///idlemax.db"
@@ -22,8 +23,13 @@ custom_style = Style(
 
 @click.command()
 @click.option("--db-path", default=DEFAULT_DB_PATH, help="Database path for the game")
-def cli(db_path: str):
-    game = Game(db_path)
+@click.option(
+    "--load-data",
+    is_flag=True,
+    help="Reload the static game data on startup, e.g. after the data files change. A new database always gets it.",
+)
+def cli(db_path: str, load_data: bool):
+    game = Game(db_path, load_game_data=load_data or None)
     actions = [
         "Create Character",
         "Show Character",
@@ -42,7 +48,7 @@ def cli(db_path: str):
             click.echo(f"Created Character: {char.character_name}")
 
         elif action == "Show Character":
-            char_names = [char.character_name for char in game.get_all_characters()]
+            char_names = game.get_all_character_names()
             if not char_names:
                 click.echo("No characters available.")
                 continue
@@ -54,7 +60,7 @@ def cli(db_path: str):
                 click.echo(f"Could not find a character with the name '{char_name}'")
 
         elif action == "Start Activity":
-            char_names = [char.character_name for char in game.get_all_characters()]
+            char_names = game.get_all_character_names()
             if not char_names:
                 click.echo("No characters available.")
                 continue
@@ -70,18 +76,19 @@ def cli(db_path: str):
                 "Choose an activity option", choices=activity_options, style=custom_style
             ).ask()
 
-            result = game.start_activity(
-                character_name=char_name,
-                activity_name=activity,
-                activity_option_name=activity_option,
-            )
-            if not result:
+            try:
+                result = game.start_activity(
+                    character_name=char_name,
+                    activity_name=activity,
+                    activity_option_name=activity_option,
+                )
+            except ValueError:
                 click.echo(f"Couldn't start {activity} - {activity_option}. Double check the skill requirements.")
                 continue
             click.echo(f"{char_name} started {result.activity.activity_name} - {activity_option}")
 
         elif action == "Stop Activity":
-            char_names = [char.character_name for char in game.get_all_characters()]
+            char_names = game.get_all_character_names()
             if not char_names:
                 click.echo("No characters available.")
                 continue
@@ -90,13 +97,11 @@ def cli(db_path: str):
             click.echo(f"Stopped current activity for {char_name}")
 
         elif action == "List Characters":
-            characters = game.get_all_characters()
+            characters = game.get_all_character_summaries()
             if not characters:
                 click.echo("No characters available.")
-            for character in characters:
-                click.echo(
-                    f"{character.character_name} - Created {character.created_at}, {character.created_at.diff_for_humans()}"
-                )
+            for character_name, created_at in characters:
+                click.echo(f"{character_name} - Created {created_at}, {humanize(created_at)}")
 
         elif action == "Exit":
             break
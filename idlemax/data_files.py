@@ -0,0 +1,20 @@
+import importlib.resources
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is an optional speedup, used only if it happens to be installed.
+    import json as _json
+
+
+def load_data_file(filename: str) -> list[dict]:
+    """Parse one of the JSON files bundled in `idlemax.data`.
+
+    Uses orjson when it's installed, falling back to the standard library otherwise.
+
+    Args:
+        filename (str): Name of the file inside `idlemax/data`, e.g. "activities.json"
+
+    Returns:
+        list[dict]: The parsed rows
+    """
+    return _json.loads(importlib.resources.files("idlemax.data").joinpath(filename).read_bytes())
@@ -1,12 +1,15 @@
-import importlib
-import json
+import bisect
 
+from idlemax.data_files import load_data_file
 
-def xp_to_level(experience: int) -> int:
-    with importlib.resources.open_text("idlemax.data", "experience_to_level.json") as f:
-        xp_level_table = json.load(f)
+_XP_LEVEL_TABLE: list[dict[str, int]] = sorted(
+    load_data_file("experience_to_level.json"), key=lambda level: level["min_xp"]
+)
+
+_MIN_XPS: list[int] = [level["min_xp"] for level in _XP_LEVEL_TABLE]
+_LEVELS: list[int] = [level["level"] for level in _XP_LEVEL_TABLE]
 
-    for level in reversed(xp_level_table):
-        if experience >= level["min_xp"]:
-            return level["level"]
-    return 1
+
+def xp_to_level(experience: int) -> int:
+    i = bisect.bisect_right(_MIN_XPS, experience) - 1
+    return _LEVELS[i] if i >= 0 else 1
@@ -1,6 +1,5 @@
 import functools
-import importlib.resources
-import json
+from datetime import datetime
 from typing import Optional
 
 import pendulum
@@ -9,6 +8,11 @@ import sqlalchemy.orm
 
 from idlemax.character import (
     Activity,
+    ActivityOption,
+    ActivityOptionExperienceReward,
+    ActivityOptionItemCost,
+    ActivityOptionItemReward,
+    ActivityOptionSkillRequirement,
     Base,
     Character,
     CharacterActivity,
@@ -16,19 +20,37 @@ from idlemax.character import (
     CharacterActivityHistory,
     CharacterActivityItemCost,
     CharacterActivityItemReward,
+    CharacterItem,
     CharacterSkill,
+    Item,
     ensure_utc,
 )
+from idlemax.data_files import load_data_file
 from idlemax.game_data import (
     ActivityData,
-    ActivityOption,
     ActivityOptionData,
+    ActivityOptionItemCostData,
+    ActivityOptionSkillRequirementData,
     CharacterActivityData,
+    CharacterActivityHistoryData,
     CharacterData,
-    CharacterItem,
     CharacterItemData,
     CharacterSkillData,
-    Item,
+    ItemData,
+)
+
+# What displaying the current activity needs (CharacterActivityData.from_orm).
+_CURRENT_ACTIVITY_LOADER_OPTIONS = (
+    sqlalchemy.orm.joinedload(CharacterActivity.activity),
+    sqlalchemy.orm.joinedload(CharacterActivity.activity_option).joinedload(ActivityOption.activity),
+)
+# What stopping the current activity additionally needs: the option's costs and rewards.
+_CURRENT_ACTIVITY_COSTS_AND_REWARDS_LOADER_OPTIONS = (
+    sqlalchemy.orm.joinedload(CharacterActivity.activity_option).options(
+        sqlalchemy.orm.selectinload(ActivityOption.item_costs),
+        sqlalchemy.orm.selectinload(ActivityOption.reward_experience),
+        sqlalchemy.orm.selectinload(ActivityOption.reward_items),
+    ),
 )
 
 
@@ -43,7 +65,7 @@ def with_session(func):
 
     @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
-        with sqlalchemy.orm.Session(self.engine) as session:
+        with self.sessionmaker() as session:
             try:
                 result = func(self, *args, session=session, **kwargs)
                 session.commit()
@@ -61,15 +83,38 @@ class Game:
     Handles character creation, activities, skills, items, and database management.
     """
 
-    def __init__(self, db_filepath: str = "sqlite:///idlemax.db"):
+    def __init__(
+        self,
+        db_filepath: str = "sqlite:///idlemax.db",
+        load_game_data: Optional[bool] = None,
+        **engine_options,
+    ):
         """
-        Initialize the Game instance and create/load the database schema and static data.
+        Initialize the Game instance and create the database schema, loading the static data if it's missing.
         Args:
             db_filepath: Path to the SQLite database file.
+            load_game_data: Whether to reload the static game data from the bundled JSON files. Only needed after
+                the data files change. By default it's only loaded into a database that doesn't have it yet.
+            **engine_options: Passed on to `sqlalchemy.create_engine`, e.g. `poolclass` for an in-memory database.
         """
-        self.engine = sqlalchemy.create_engine(db_filepath)
+        self.engine = sqlalchemy.create_engine(db_filepath, **engine_options)
+        # Every session the game opens comes from this one factory, bound to the one engine (and connection pool).
+        self.sessionmaker = sqlalchemy.orm.sessionmaker(self.engine)
         Base.metadata.create_all(self.engine)
-        with sqlalchemy.orm.Session(self.engine) as session:
+        if load_game_data is None:
+            with self.sessionmaker() as session:
+                load_game_data = session.scalar(sqlalchemy.select(Activity.activity_id).limit(1)) is None
+        if load_game_data:
+            self.load_game_data()
+        else:
+            self._cache_reference_data()
+
+    def load_game_data(self) -> None:
+        """
+        Replace the static game data (activities, items, options, requirements, costs and rewards) with the
+        contents of the bundled JSON files.
+        """
+        with self.sessionmaker() as session:
             self._load_activities(session)
             self._load_items(session)
             self._load_activity_options(session)
@@ -78,75 +123,98 @@ class Game:
             self._load_item_rewards(session)
             self._load_experience_rewards(session)
             session.commit()
+        self._cache_reference_data()
+
+    def _cache_reference_data(self) -> None:
+        # Activities, their options (with their requirements and costs) and items are static reference data, only
+        # changed by load_game_data. Cache them so lookups skip the DB.
+        with self.sessionmaker() as session:
+            self._activities_by_name: dict[str, ActivityData] = {
+                activity.activity_name: ActivityData.from_orm(activity)
+                for activity in session.scalars(sqlalchemy.select(Activity).order_by(Activity.activity_id))
+            }
+            self._items_by_name: dict[str, ItemData] = {
+                item.item_name: ItemData.from_orm(item)
+                for item in session.scalars(sqlalchemy.select(Item).order_by(Item.item_id))
+            }
+            self._activity_options_by_activity_id: dict[int, list[ActivityOptionData]] = {}
+            for activity_option in session.scalars(
+                sqlalchemy.select(ActivityOption)
+                .options(sqlalchemy.orm.joinedload(ActivityOption.activity))
+                .order_by(ActivityOption.activity_option_id)
+            ):
+                self._activity_options_by_activity_id.setdefault(activity_option.activity_id, []).append(
+                    ActivityOptionData.from_orm(activity_option)
+                )
+            self._skill_requirements_by_activity_option_id: dict[int, list[ActivityOptionSkillRequirementData]] = {}
+            for skill_requirement in session.scalars(sqlalchemy.select(ActivityOptionSkillRequirement)):
+                self._skill_requirements_by_activity_option_id.setdefault(
+                    skill_requirement.activity_option_id, []
+                ).append(ActivityOptionSkillRequirementData.from_orm(skill_requirement))
+            self._item_costs_by_activity_option_id: dict[int, list[ActivityOptionItemCostData]] = {}
+            for item_cost in session.scalars(sqlalchemy.select(ActivityOptionItemCost)):
+                self._item_costs_by_activity_option_id.setdefault(item_cost.activity_option_id, []).append(
+                    ActivityOptionItemCostData.from_orm(item_cost)
+                )
+        self._activities_by_id: dict[int, ActivityData] = {
+            activity.activity_id: activity for activity in self._activities_by_name.values()
+        }
+        self._activity_options_by_id: dict[int, ActivityOptionData] = {
+            activity_option.activity_option_id: activity_option
+            for activity_options in self._activity_options_by_activity_id.values()
+            for activity_option in activity_options
+        }
 
     def _load_item_rewards(self, session: sqlalchemy.orm.Session) -> None:
-        from idlemax.character import ActivityOptionItemReward
-
-        session.query(ActivityOptionItemReward).delete()
-        with importlib.resources.open_text("idlemax.data", "activity_option_item_rewards.json") as f:
-            item_rewards: list[dict[str, int]] = json.load(f)
-        session.add_all([ActivityOptionItemReward(**item_reward) for item_reward in item_rewards])
+        session.execute(sqlalchemy.delete(ActivityOptionItemReward))
+        item_rewards: list[dict[str, int]] = load_data_file("activity_option_item_rewards.json")
+        session.execute(sqlalchemy.insert(ActivityOptionItemReward), item_rewards)
 
     def _load_experience_rewards(self, session: sqlalchemy.orm.Session) -> None:
-        from idlemax.character import ActivityOptionExperienceReward
-
-        session.query(ActivityOptionExperienceReward).delete()
-        with importlib.resources.open_text("idlemax.data", "activity_option_experience_rewards.json") as f:
-            xp_rewards: list[dict[str, int]] = json.load(f)
-        session.add_all([ActivityOptionExperienceReward(**xp_reward) for xp_reward in xp_rewards])
+        session.execute(sqlalchemy.delete(ActivityOptionExperienceReward))
+        xp_rewards: list[dict[str, int]] = load_data_file("activity_option_experience_rewards.json")
+        session.execute(sqlalchemy.insert(ActivityOptionExperienceReward), xp_rewards)
 
     def _load_skill_requirements(self, session: sqlalchemy.orm.Session) -> None:
-        from idlemax.game_data import ActivityOptionSkillRequirement
-
-        session.query(ActivityOptionSkillRequirement).delete()
-        with importlib.resources.open_text("idlemax.data", "activity_option_skill_requirements.json") as f:
-            skill_requirements: list[dict] = json.load(f)
-        session.add_all([ActivityOptionSkillRequirement(**requirement) for requirement in skill_requirements])
+        session.execute(sqlalchemy.delete(ActivityOptionSkillRequirement))
+        skill_requirements: list[dict] = load_data_file("activity_option_skill_requirements.json")
+        session.execute(sqlalchemy.insert(ActivityOptionSkillRequirement), skill_requirements)
 
     def _load_item_costs(self, session: sqlalchemy.orm.Session) -> None:
-        from idlemax.game_data import ActivityOptionItemCost
-
-        session.query(ActivityOptionItemCost).delete()
-        with importlib.resources.open_text("idlemax.data", "activity_option_item_costs.json") as f:
-            item_costs: list[dict] = json.load(f)
-        session.add_all([ActivityOptionItemCost(**cost) for cost in item_costs])
+        session.execute(sqlalchemy.delete(ActivityOptionItemCost))
+        item_costs: list[dict] = load_data_file("activity_option_item_costs.json")
+        session.execute(sqlalchemy.insert(ActivityOptionItemCost), item_costs)
 
     def _load_activity_options(self, session: sqlalchemy.orm.Session) -> None:
-        session.query(ActivityOption).delete()
-        with importlib.resources.open_text("idlemax.data", "activity_options.json") as f:
-            activity_options: list[dict] = json.load(f)
-        session.add_all([ActivityOption(**activity_option) for activity_option in activity_options])
+        session.execute(sqlalchemy.delete(ActivityOption))
+        activity_options: list[dict] = load_data_file("activity_options.json")
+        session.execute(sqlalchemy.insert(ActivityOption), activity_options)
 
     def _load_items(self, session: sqlalchemy.orm.Session) -> None:
-        session.query(Item).delete()
-        with importlib.resources.open_text("idlemax.data", "items.json") as f:
-            items: list[dict] = json.load(f)
-        session.add_all([Item(**item) for item in items])
+        session.execute(sqlalchemy.delete(Item))
+        items: list[dict] = load_data_file("items.json")
+        session.execute(sqlalchemy.insert(Item), items)
 
     def _load_activities(self, session: sqlalchemy.orm.Session) -> None:
-        session.query(Activity).delete()
-        with importlib.resources.open_text("idlemax.data", "activities.json") as f:
-            activities: list[dict] = json.load(f)
-        session.add_all([Activity(**activity) for activity in activities])
+        session.execute(sqlalchemy.delete(Activity))
+        activities: list[dict] = load_data_file("activities.json")
+        session.execute(sqlalchemy.insert(Activity), activities)
 
-    def _init_character_skills(self, character_name: str, session: sqlalchemy.orm.Session):
+    def _init_character_skills(self, character: Character, session: sqlalchemy.orm.Session):
         """
-        Initialize all skill records for a new character.
+        Initialize all skill records for a new character, in a single batched insert.
         Args:
-            character_name: The name of the character.
+            character: The new, already flushed, Character ORM object.
             session: SQLAlchemy session.
         """
-        char: Character = session.query(Character).filter_by(character_name=character_name).one()
-        skills: list[Activity] = session.query(Activity).filter_by(activity_type="skill").all()
-        for skill in skills:
-            char_skill = (
-                session.query(CharacterSkill)
-                .filter_by(character_id=char.character_id, activity_id=skill.activity_id)
-                .one_or_none()
+        skill_ids = [
+            activity.activity_id for activity in self._activities_by_name.values() if activity.activity_type == "skill"
+        ]
+        if skill_ids:
+            session.execute(
+                sqlalchemy.insert(CharacterSkill),
+                [{"character_id": character.character_id, "activity_id": skill_id} for skill_id in skill_ids],
             )
-            if not char_skill:
-                new_char_skill = CharacterSkill(character_id=char.character_id, activity_id=skill.activity_id)
-                session.add(new_char_skill)
 
     @with_session
     def create_character(self, character_name: str, session: sqlalchemy.orm.Session) -> CharacterData:
@@ -161,7 +229,12 @@ class Game:
         char = Character(character_name=character_name)
         session.add(char)
         session.flush()  # To get autogenerated fields like character_id
-        self._init_character_skills(character_name, session)
+        self._init_character_skills(char, session)
+        char = session.execute(
+            sqlalchemy.select(Character)
+            .where(Character.character_id == char.character_id)
+            .options(*CharacterData.loader_options())
+        ).scalar_one()
         return CharacterData.from_orm(char)
 
     def _get_character_by_name(self, character_name: str, session: sqlalchemy.orm.Session) -> Character:
@@ -174,16 +247,18 @@ class Game:
         Returns:
             Character ORM object or None if not found.
         """
-        return session.query(Character).filter_by(character_name=character_name).one()
+        return session.execute(
+            sqlalchemy.select(Character).where(Character.character_name == character_name)
+        ).scalar_one()
 
     def _get_character_skill(
-        self, character: Character, skill: Activity, session: sqlalchemy.orm.Session
+        self, character: Character, skill: ActivityData, session: sqlalchemy.orm.Session
     ) -> CharacterSkill:
         """Get a character's skill ORM object.
 
         Args:
             character: Character ORM object.
-            skill: Activity ORM object representing the skill.
+            skill: ActivityData for the skill.
             session: SQLAlchemy session.
 
         Returns:
@@ -192,27 +267,35 @@ class Game:
         Raises:
             sqlalchemy.exc.NoResultFound: If skill not found for character.
         """
-        return (
-            session.query(CharacterSkill)
-            .filter_by(character_id=character.character_id, activity_id=skill.activity_id)
-            .one()
-        )
+        return session.execute(
+            sqlalchemy.select(CharacterSkill).where(
+                CharacterSkill.character_id == character.character_id, CharacterSkill.activity_id == skill.activity_id
+            )
+        ).scalar_one()
 
     def _get_current_activity(
-        self, character: Character, session: sqlalchemy.orm.Session
+        self, character: Character, session: sqlalchemy.orm.Session, load_costs_and_rewards: bool = False
     ) -> Optional[CharacterActivity]:
         """Get the current activity ORM object for a character.
 
         Args:
-            character_name: The name of the character.
+            character: Character ORM object.
             session: SQLAlchemy session.
+            load_costs_and_rewards: Also eagerly load the activity option's item costs and rewards.
 
         Returns:
             CharacterActivity ORM object or None if no current activity.
         """
         if not character:
             return None
-        return session.query(CharacterActivity).filter_by(character_id=character.character_id).one_or_none()
+        statement = (
+            sqlalchemy.select(CharacterActivity)
+            .where(CharacterActivity.character_id == character.character_id)
+            .options(*_CURRENT_ACTIVITY_LOADER_OPTIONS)
+        )
+        if load_costs_and_rewards:
+            statement = statement.options(*_CURRENT_ACTIVITY_COSTS_AND_REWARDS_LOADER_OPTIONS)
+        return session.execute(statement).scalar_one_or_none()
 
     @with_session
     def get_character_by_name(self, character_name: str, session: sqlalchemy.orm.Session) -> CharacterData:
@@ -224,49 +307,80 @@ class Game:
         Returns:
             CharacterData or None if not found.
         """
-        return CharacterData.from_orm(self._get_character_by_name(character_name, session))
+        character = session.execute(
+            sqlalchemy.select(Character)
+            .where(Character.character_name == character_name)
+            .options(*CharacterData.loader_options())
+        ).scalar_one()
+        return CharacterData.from_orm(character)
 
-    def _get_activity_by_name(self, activity_name: str, session: sqlalchemy.orm.Session) -> Activity:
-        """Get an activity ORM object by name.
+    def get_activity_by_name(self, activity_name: str) -> ActivityData:
+        """Get an activity's data by name, from the cache built at startup.
 
         Args:
             activity_name: The name of the activity.
-            session: SQLAlchemy session.
 
         Returns:
-            Activity ORM object.
+            ActivityData for the activity.
 
         Raises:
             sqlalchemy.exc.NoResultFound: If activity not found.
         """
-        return session.query(Activity).filter_by(activity_name=activity_name).one()
+        try:
+            return self._activities_by_name[activity_name]
+        except KeyError:
+            raise sqlalchemy.exc.NoResultFound(f"No activity named '{activity_name}'") from None
 
-    @with_session
-    def get_activity_by_name(self, activity_name: str, session: sqlalchemy.orm.Session) -> ActivityData:
-        """Get an activity's data by name.
+    def _get_activity_option(self, activity: ActivityData, activity_option_name: str) -> ActivityOptionData:
+        """Get one of an activity's options by name, from the cache built at startup.
 
         Args:
-            activity_name: The name of the activity.
-            session: SQLAlchemy session (provided by decorator).
+            activity: ActivityData for the activity.
+            activity_option_name: The name of the option.
 
         Returns:
-            ActivityData for the activity.
+            ActivityOptionData for the option.
 
         Raises:
-            sqlalchemy.exc.NoResultFound: If activity not found.
+            sqlalchemy.exc.NoResultFound: If the activity has no option with that name.
         """
-        activity = self._get_activity_by_name(activity_name, session)
-        return ActivityData.from_orm(activity)
-
-    def _get_character_item(self, character_id: int, item_id: int, session: sqlalchemy.orm.Session) -> CharacterItem:
-        character_item = (
-            session.query(CharacterItem).filter_by(character_id=character_id, item_id=item_id).one_or_none()
+        for activity_option in self._activity_options_by_activity_id.get(activity.activity_id, []):
+            if activity_option.activity_option_name == activity_option_name:
+                return activity_option
+        raise sqlalchemy.exc.NoResultFound(
+            f"No option named '{activity_option_name}' for activity '{activity.activity_name}'"
         )
-        if not character_item:
-            character_item = CharacterItem(character_id=character_id, item_id=item_id)
-            session.add(character_item)
-            session.flush()
-        return character_item
+
+    def _get_character_items(
+        self, character_id: int, item_ids: set[int], session: sqlalchemy.orm.Session
+    ) -> dict[int, CharacterItem]:
+        """Get several of a character's CharacterItem ORM objects in one query, creating any that don't exist yet.
+
+        Args:
+            character_id: The character's ID.
+            item_ids: IDs of the items to get.
+            session: SQLAlchemy session.
+
+        Returns:
+            Dict of CharacterItem ORM objects, keyed by item_id.
+        """
+        if not item_ids:
+            return {}
+        character_items = {
+            character_item.item_id: character_item
+            for character_item in session.scalars(
+                sqlalchemy.select(CharacterItem).where(
+                    CharacterItem.character_id == character_id, CharacterItem.item_id.in_(item_ids)
+                )
+            )
+        }
+        missing_item_ids = item_ids - character_items.keys()
+        for item_id in missing_item_ids:
+            character_items[item_id] = CharacterItem(character_id=character_id, item_id=item_id)
+            session.add(character_items[item_id])
+        if missing_item_ids:
+            session.flush()  # To get the default quantity
+        return character_items
 
     @with_session
     def start_activity(
@@ -284,25 +398,25 @@ class Game:
             activity_option_name: The specific option for the activity.
             session: SQLAlchemy session (provided by decorator).
         Returns:
-            None
+            CharacterActivityData for the new activity.
+        Raises:
+            sqlalchemy.exc.NoResultFound: If the character, activity or option doesn't exist.
+            ValueError: If the character doesn't meet the option's skill requirements or item costs.
         """
         character = self._get_character_by_name(character_name, session)
-        current_activity = self._get_current_activity(character, session)
-        if current_activity:
-            self._stop_current_activity(character, session)
-        new_activity = session.query(Activity).filter_by(activity_name=activity_name).one()
-        activity_option: ActivityOption = (
-            session.query(ActivityOption)
-            .filter_by(activity_id=new_activity.activity_id, activity_option_name=activity_option_name)
-            .one()
-        )
+        # No-op when the character isn't doing anything.
+        self._stop_current_activity(character, session)
+        new_activity = self.get_activity_by_name(activity_name)
+        activity_option = self._get_activity_option(new_activity, activity_option_name)
 
         # For each skill requirement, check it against the character.
         requirements_not_met = []
-        for skill_requirement in activity_option.skill_requirements:
+        for skill_requirement in self._skill_requirements_by_activity_option_id.get(
+            activity_option.activity_option_id, []
+        ):
             character_skill = self._get_character_skill(
                 character,
-                new_activity,
+                self._activities_by_id[skill_requirement.skill_id],
                 session,
             )
             if character_skill.level < skill_requirement.required_level:
@@ -316,9 +430,13 @@ class Game:
         if requirements_not_met:
             raise ValueError(requirements_not_met)
 
+        item_costs = self._item_costs_by_activity_option_id.get(activity_option.activity_option_id, [])
+        character_items = self._get_character_items(
+            character.character_id, {item_cost.item_id for item_cost in item_costs}, session
+        )
         item_costs_not_met = []
-        for item_cost in activity_option.item_costs:
-            character_item: CharacterItem = self._get_character_item(character.character_id, item_cost.item_id, session)
+        for item_cost in item_costs:
+            character_item = character_items[item_cost.item_id]
             if item_cost.quantity > character_item.quantity:
                 item_costs_not_met.append(
                     {
@@ -330,9 +448,6 @@ class Game:
         if item_costs_not_met:
             raise ValueError(item_costs_not_met)
 
-        character_activity = (
-            session.query(CharacterActivity).filter_by(character_id=character.character_id).one_or_none()
-        )
         new_character_activity = CharacterActivity(
             character_id=character.character_id,
             activity_id=new_activity.activity_id,
@@ -340,31 +455,52 @@ class Game:
         )
         session.add(new_character_activity)
         session.flush()
-        return CharacterActivityData.from_orm(new_character_activity)
+        # Built from the cached activity and option rather than from_orm, which would lazy load both.
+        return CharacterActivityData(
+            character_activity_id=new_character_activity.character_activity_id,
+            character_id=new_character_activity.character_id,
+            activity_id=new_character_activity.activity_id,
+            activity_option_id=new_character_activity.activity_option_id,
+            started_at=ensure_utc(new_character_activity.started_at),
+            activity=new_activity,
+            activity_option=activity_option,
+            created_at=new_character_activity.created_at,
+            updated_at=new_character_activity.updated_at,
+        )
 
-    def _stop_current_activity(self, character: Character, session: sqlalchemy.orm.Session) -> None:
+    def _stop_current_activity(
+        self, character: Character, session: sqlalchemy.orm.Session
+    ) -> Optional[CharacterActivityHistory]:
         """
         Stop the current activity for a character, reward XP and items.
         Args:
-            character_name: The name of the character.
+            character: Character ORM object.
             session: SQLAlchemy session.
         Returns:
-            None
+            The new, unflushed, CharacterActivityHistory ORM object, or None if the character wasn't doing anything.
         """
         ended_at = pendulum.now("utc")
-        current_activity = self._get_current_activity(character, session)
+        current_activity = self._get_current_activity(character, session, load_costs_and_rewards=True)
         if not current_activity:
-            return
+            return None
 
         activity_option = current_activity.activity_option
         activity_duration = ended_at.diff(ensure_utc(current_activity.started_at)).seconds
         session.delete(current_activity)
 
+        # Every item this activity takes or gives, fetched once rather than once per loop below.
+        character_items = self._get_character_items(
+            character.character_id,
+            {item_cost.item_id for item_cost in activity_option.item_costs}
+            | {reward_item.item_id for reward_item in activity_option.reward_items},
+            session,
+        )
+
         # TODO: Remove workaround. Python doesn't like min of empty list, which happens when there's no item requirements.
         if activity_option.item_costs:
             item_cost_limits = []
             for item_cost in activity_option.item_costs:
-                character_item = self._get_character_item(character.character_id, item_cost.item_id, session)
+                character_item = character_items[item_cost.item_id]
                 item_cost_limits.append(character_item.quantity // item_cost.quantity)
             item_cost_limit = min(item_cost_limits)
             time_limit = activity_duration // activity_option.action_time
@@ -372,22 +508,21 @@ class Game:
         else:
             actions_completed = activity_duration // activity_option.action_time
 
-        char_skill: CharacterSkill = (
-            session.query(CharacterSkill)
-            .filter_by(character_id=character.character_id, activity_id=current_activity.activity_id)
-            .one()
-        )
-
+        # Setting the relationships up front, even to empty lists, means converting the history to
+        # CharacterActivityHistoryData afterwards doesn't lazy load any of them.
         character_activity_history = CharacterActivityHistory(
             character_id=character.character_id,
-            activity_option_id=activity_option.activity_option_id,
+            activity_option=activity_option,
             started_at=current_activity.started_at,
             ended_at=ended_at,
+            item_costs=[],
+            experience_rewards=[],
+            item_rewards=[],
         )
 
         # Consume items based on actions completed
         for item_cost in activity_option.item_costs:
-            chracter_item = self._get_character_item(character.character_id, item_cost.item_id, session)
+            chracter_item = character_items[item_cost.item_id]
             character_activity_history.item_costs.append(
                 CharacterActivityItemCost(
                     character_activity_history_id=character_activity_history.character_activity_history_id,
@@ -400,7 +535,16 @@ class Game:
 
         # Reward experience
         for reward_experience in activity_option.reward_experience:
-            char_skill.experience += actions_completed * reward_experience.experience
+            if actions_completed:
+                # Incremented in SQL, so the skill doesn't have to be selected first.
+                session.execute(
+                    sqlalchemy.update(CharacterSkill)
+                    .where(
+                        CharacterSkill.character_id == character.character_id,
+                        CharacterSkill.activity_id == reward_experience.skill_id,
+                    )
+                    .values(experience=CharacterSkill.experience + actions_completed * reward_experience.experience)
+                )
             character_activity_history.experience_rewards.append(
                 CharacterActivityExperienceReward(
                     character_activity_history_id=character_activity_history.character_activity_history_id,
@@ -419,10 +563,11 @@ class Game:
                     quantity=reward_item.quantity,
                 )
             )
-            character_item = self._get_character_item(character.character_id, reward_item.item_id, session)
+            character_item = character_items[reward_item.item_id]
             character_item.quantity += reward_item.quantity * actions_completed
 
         session.add(character_activity_history)
+        return character_activity_history
 
     @with_session
     def get_current_activity(
@@ -434,26 +579,40 @@ class Game:
             character_name: The name of the character.
             session: SQLAlchemy session (provided by decorator).
         Returns:
-            CharacterActivityData or None if not found.
+            CharacterActivityData or None if the character isn't doing anything.
+        Raises:
+            sqlalchemy.exc.NoResultFound: If the character doesn't exist.
         """
-        character = self._get_character_by_name(character_name, session)
-        current_activity = self._get_current_activity(character, session)
-        if not current_activity:
+        # Read-only, so select plain columns in one statement rather than hydrating ORM objects; the option and its
+        # activity come from the reference cache. The outer join keeps a row for a character with no current activity.
+        row = session.execute(
+            sqlalchemy.select(*CharacterActivityData.row_columns())
+            .select_from(Character)
+            .outerjoin(CharacterActivity, CharacterActivity.character_id == Character.character_id)
+            .where(Character.character_name == character_name)
+        ).one()
+        if row.character_activity_id is None:
             return None
-        return CharacterActivityData.from_orm(current_activity)
+        return CharacterActivityData.from_row(row, self._activity_options_by_id[row.activity_option_id])
 
     @with_session
-    def stop_current_activity(self, character_name, session: sqlalchemy.orm.Session) -> None:
+    def stop_current_activity(
+        self, character_name: str, session: sqlalchemy.orm.Session
+    ) -> Optional[CharacterActivityHistoryData]:
         """
         Stop the current activity for a character.
         Args:
             character_name: The name of the character.
             session: SQLAlchemy session (provided by decorator).
         Returns:
-            None
+            CharacterActivityHistoryData for the activity just ended, or None if the character wasn't doing anything.
         """
         character = self._get_character_by_name(character_name, session)
-        self._stop_current_activity(character, session)
+        character_activity_history = self._stop_current_activity(character, session)
+        if not character_activity_history:
+            return None
+        session.flush()  # To get autogenerated fields like character_activity_history_id
+        return CharacterActivityHistoryData.from_orm(character_activity_history)
 
     @with_session
     def get_all_characters(self, session: sqlalchemy.orm.Session) -> list[CharacterData]:
@@ -464,53 +623,76 @@ class Game:
         Returns:
             List of CharacterData objects.
         """
-        characters = session.query(Character).all()
+        characters = session.scalars(sqlalchemy.select(Character).options(*CharacterData.loader_options())).all()
         return [CharacterData.from_orm(character) for character in characters]
 
     @with_session
-    def get_all_activities(self, session: sqlalchemy.orm.Session) -> list[ActivityData]:
+    def get_all_character_names(self, session: sqlalchemy.orm.Session) -> list[str]:
         """
-        Get all activities in the database.
+        Get the names of all characters, without loading the characters themselves.
         Args:
             session: SQLAlchemy session (provided by decorator).
         Returns:
-            List of ActivityData objects.
+            List of character names, in creation order.
         """
-        activities = session.query(Activity).all()
-        return [ActivityData.from_orm(activity) for activity in activities]
+        return list(session.scalars(sqlalchemy.select(Character.character_name).order_by(Character.character_id)).all())
 
     @with_session
-    def get_all_activity_options(self, activity_name: str, session: sqlalchemy.orm.Session) -> list[ActivityOptionData]:
+    def get_all_character_summaries(self, session: sqlalchemy.orm.Session) -> list[tuple[str, datetime]]:
         """
-        Get all activity options for a given activity.
+        Get the name and creation time of every character, without loading the characters themselves.
         Args:
-            activity_name: The name of the activity.
             session: SQLAlchemy session (provided by decorator).
-            character_name: (Optional) The name of the character (for filtering options).
+        Returns:
+            List of (character_name, created_at) tuples, in creation order.
+        """
+        rows = session.execute(
+            sqlalchemy.select(Character.character_name, Character.created_at).order_by(Character.character_id)
+        ).all()
+        return [(character_name, ensure_utc(created_at)) for character_name, created_at in rows]
+
+    def get_all_activities(self) -> list[ActivityData]:
+        """
+        Get all activities, from the cache built at startup.
+        Returns:
+            List of ActivityData objects.
+        """
+        return list(self._activities_by_name.values())
+
+    def get_all_activity_options(self, activity_name: str) -> list[ActivityOptionData]:
+        """
+        Get all activity options for a given activity, from the cache built at startup.
+        Args:
+            activity_name: The name of the activity.
         Returns:
             List of ActivityOptionData objects.
+        Raises:
+            sqlalchemy.exc.NoResultFound: If activity not found.
         """
-        activity = session.query(Activity).filter_by(activity_name=activity_name).one()
-        activity_options = session.query(ActivityOption).filter_by(activity_id=activity.activity_id).all()
-        return [ActivityOptionData.from_orm(activity_option) for activity_option in activity_options]
+        activity = self.get_activity_by_name(activity_name)
+        return list(self._activity_options_by_activity_id.get(activity.activity_id, []))
 
-    def _get_item_by_name(self, item_name: str, session: sqlalchemy.orm.Session) -> Item:
-        return session.query(Item).filter_by(item_name=item_name).one()
+    def _get_item_by_name(self, item_name: str) -> ItemData:
+        try:
+            return self._items_by_name[item_name]
+        except KeyError:
+            raise sqlalchemy.exc.NoResultFound(f"No item named '{item_name}'") from None
 
     def _get_character_item_by_name(
         self, character_name: str, item_name: str, session: sqlalchemy.orm.Session
     ) -> CharacterItem:
-        item = self._get_item_by_name(item_name, session)
-        character = self._get_character_by_name(character_name, session)
-
-        character_item = (
-            session.query(CharacterItem)
-            .filter_by(character_id=character.character_id, item_id=item.item_id)
-            .one_or_none()
-        )
+        item = self._get_item_by_name(item_name)
+        # One query, joined to the character by name; the character is only looked up on its own if there's no row.
+        character_item = session.execute(
+            sqlalchemy.select(CharacterItem)
+            .join(Character, Character.character_id == CharacterItem.character_id)
+            .where(Character.character_name == character_name, CharacterItem.item_id == item.item_id)
+            .options(sqlalchemy.orm.joinedload(CharacterItem.item))
+        ).scalar_one_or_none()
 
         # If the CharacterItem doesn't exist yet, create it, and add it to the session.
         if not character_item:
+            character = self._get_character_by_name(character_name, session)
             character_item = CharacterItem(character_id=character.character_id, item_id=item.item_id)
             session.add(character_item)
             session.flush()
@@ -555,15 +737,16 @@ class Game:
     def _get_character_skill_by_name(
         self, character_name: str, skill_name: str, session: sqlalchemy.orm.Session
     ) -> CharacterSkill:
-        skill = self._get_activity_by_name(activity_name=skill_name, session=session)
-        character = self._get_character_by_name(character_name, session)
-        character_skill = (
-            session.query(CharacterSkill)
-            .filter_by(character_id=character.character_id, activity_id=skill.activity_id)
-            .one_or_none()
-        )
+        skill = self.get_activity_by_name(skill_name)
+        character_skill = session.execute(
+            sqlalchemy.select(CharacterSkill)
+            .join(Character, Character.character_id == CharacterSkill.character_id)
+            .where(Character.character_name == character_name, CharacterSkill.activity_id == skill.activity_id)
+            .options(sqlalchemy.orm.joinedload(CharacterSkill.skill))
+        ).scalar_one_or_none()
 
         if not character_skill:
+            character = self._get_character_by_name(character_name, session)
             character_skill = CharacterSkill(character_id=character.character_id, activity_id=skill.activity_id)
             session.add(character_skill)
         return character_skill
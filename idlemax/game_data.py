@@ -1,7 +1,11 @@
-from dataclasses import dataclass
+import functools
+import operator
+from dataclasses import dataclass, field, fields
+from datetime import datetime
 from typing import Optional
 
 import pendulum
+import sqlalchemy
 import sqlalchemy.orm
 
 from idlemax.character import (
@@ -19,21 +23,38 @@ from idlemax.character import (
     CharacterSkill,
     Item,
     ensure_utc,
+    humanize,
 )
 from idlemax.experience_to_level import xp_to_level
 
+# When on, CharacterData.loader_options() makes any lazy load that would emit SQL raise instead, turning an
+# accidental N+1 into an error.
+STRICT_LOADING = True
 
-@dataclass
+
+@dataclass(slots=True)
 class TimestampMixinDTO:
-    created_at: pendulum.DateTime
-    updated_at: pendulum.DateTime
+    created_at: datetime
+    updated_at: datetime
 
     def __post_init__(self):
-        self.created_at = pendulum.instance(self.created_at, tz="utc")
-        self.updated_at = pendulum.instance(self.updated_at, tz="utc")
+        self.created_at = ensure_utc(self.created_at)
+        self.updated_at = ensure_utc(self.updated_at)
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenTimestampMixinDTO:
+    """TimestampMixinDTO for reference data, whose instances are shared between callers and so can't be changed."""
 
+    created_at: datetime
+    updated_at: datetime
+
+    def __post_init__(self):
+        object.__setattr__(self, "created_at", ensure_utc(self.created_at))
+        object.__setattr__(self, "updated_at", ensure_utc(self.updated_at))
 
-@dataclass
+
+@dataclass(slots=True)
 class ActivityOptionItemCostData:
     activity_option_item_cost_id: int
     activity_option_id: int
@@ -50,15 +71,10 @@ class ActivityOptionItemCostData:
         Returns:
             ActivityOptionItemCostData: A data transfer object representing the item cost
         """
-        return cls(
-            activity_option_item_cost_id=item_cost.activity_option_item_cost_id,
-            activity_option_id=item_cost.activity_option_id,
-            item_id=item_cost.item_id,
-            quantity=item_cost.quantity,
-        )
+        return cls(*_FIELD_GETTERS[cls](item_cost))
 
 
-@dataclass
+@dataclass(slots=True)
 class ActivityOptionSkillRequirementData:
     activity_option_skill_requirement_id: int
     activity_option_id: int
@@ -75,16 +91,11 @@ class ActivityOptionSkillRequirementData:
         Returns:
             ActivityOptionSkillRequirementData: A data transfer object representing the skill requirement
         """
-        return cls(
-            activity_option_skill_requirement_id=skill_requirement.activity_option_skill_requirement_id,
-            activity_option_id=skill_requirement.activity_option_id,
-            skill_id=skill_requirement.skill_id,
-            required_level=skill_requirement.required_level,
-        )
+        return cls(*_FIELD_GETTERS[cls](skill_requirement))
 
 
-@dataclass
-class ItemData(TimestampMixinDTO):
+@dataclass(slots=True, frozen=True)
+class ItemData(FrozenTimestampMixinDTO):
     """Data transfer object for Item ORM model.
 
     This class provides a plain data representation of an Item,
@@ -93,12 +104,18 @@ class ItemData(TimestampMixinDTO):
     Attributes:
         item_id (int): Unique identifier for the item
         item_name (str): Unique name of the item
-        created_at (pendulum.DateTime): UTC timestamp when the item was created
-        updated_at (pendulum.DateTime): UTC timestamp when the item was last updated
+        display_name (str): The item name formatted for display (e.g., "Bronze Bar")
+        created_at (datetime): UTC timestamp when the item was created
+        updated_at (datetime): UTC timestamp when the item was last updated
     """
 
     item_id: int
     item_name: str
+    display_name: str = field(init=False)
+
+    def __post_init__(self):
+        FrozenTimestampMixinDTO.__post_init__(self)
+        object.__setattr__(self, "display_name", self.item_name.title())
 
     @classmethod
     def from_orm(cls, item: Item) -> "ItemData":
@@ -110,15 +127,10 @@ class ItemData(TimestampMixinDTO):
         Returns:
             ItemData: A data transfer object representing the item
         """
-        return cls(
-            item_id=item.item_id,
-            item_name=item.item_name,
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-        )
+        return _cached_item_data(item.item_id, item.item_name, item.created_at, item.updated_at)
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterItemData(TimestampMixinDTO):
     """Data transfer object for CharacterItem ORM model.
 
@@ -137,7 +149,6 @@ class CharacterItemData(TimestampMixinDTO):
     character_id: int
     item_id: int
     quantity: int
-    character: "CharacterData"
     item: ItemData
 
     @classmethod
@@ -155,7 +166,6 @@ class CharacterItemData(TimestampMixinDTO):
             character_id=character_item.character_id,
             item_id=character_item.item_id,
             quantity=character_item.quantity,
-            character=character_item.character,
             item=ItemData.from_orm(character_item.item),
             created_at=character_item.created_at,
             updated_at=character_item.updated_at,
@@ -167,11 +177,11 @@ class CharacterItemData(TimestampMixinDTO):
         Returns:
             str: A string representation showing the item name and quantity
         """
-        return f"{self.item.item_name.title()}: {self.quantity:,}"
+        return f"{self.item.display_name}: {self.quantity:,}"
 
 
-@dataclass
-class ActivityData(TimestampMixinDTO):
+@dataclass(slots=True, frozen=True)
+class ActivityData(FrozenTimestampMixinDTO):
     """Data transfer object for Activity ORM model.
 
     This class represents a type of activity that can be performed,
@@ -181,11 +191,17 @@ class ActivityData(TimestampMixinDTO):
         activity_id (int): Unique identifier for the activity
         activity_name (str): Name of the activity (e.g., "mining")
         activity_type (str): Type of activity (affects game mechanics)
+        display_name (str): The activity name formatted for display (e.g., "Mining")
     """
 
     activity_id: int
     activity_name: str
     activity_type: str
+    display_name: str = field(init=False)
+
+    def __post_init__(self):
+        FrozenTimestampMixinDTO.__post_init__(self)
+        object.__setattr__(self, "display_name", self.activity_name.title())
 
     @classmethod
     def from_orm(cls, activity: Activity) -> "ActivityData":
@@ -197,17 +213,11 @@ class ActivityData(TimestampMixinDTO):
         Returns:
             ActivityData: A data transfer object representing the activity
         """
-        return cls(
-            activity_id=activity.activity_id,
-            activity_name=activity.activity_name,
-            activity_type=activity.activity_type,
-            created_at=activity.created_at,
-            updated_at=activity.updated_at,
-        )
+        return _cached_activity_data(*_activity_key(activity))
 
 
-@dataclass
-class ActivityOptionData(TimestampMixinDTO):
+@dataclass(slots=True, frozen=True)
+class ActivityOptionData(FrozenTimestampMixinDTO):
     """Data transfer object for ActivityOption ORM model.
 
     This class represents a specific action that can be performed within an activity,
@@ -236,18 +246,18 @@ class ActivityOptionData(TimestampMixinDTO):
         Returns:
             ActivityOptionData: A data transfer object representing the activity option
         """
-        return cls(
-            activity_option_id=activity_option.activity_option_id,
-            activity_option_name=activity_option.activity_option_name,
-            activity_id=activity_option.activity_id,
-            action_time=activity_option.action_time,
-            activity=ActivityData.from_orm(activity_option.activity),
-            created_at=activity_option.created_at,
-            updated_at=activity_option.updated_at,
+        return _cached_activity_option_data(
+            activity_option.activity_option_id,
+            activity_option.activity_option_name,
+            activity_option.activity_id,
+            activity_option.action_time,
+            activity_option.created_at,
+            activity_option.updated_at,
+            _activity_key(activity_option.activity),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterSkillData(TimestampMixinDTO):
     """Data transfer object for CharacterSkill ORM model.
 
@@ -260,11 +270,9 @@ class CharacterSkillData(TimestampMixinDTO):
         activity_id (int): ID of the related activity
         experience (int): Total experience points in this skill
         activity (ActivityData): Details of the related activity
-        created_at (pendulum.DateTime): UTC timestamp when the skill was first gained
-        updated_at (pendulum.DateTime): UTC timestamp when last updated
-
-    Properties:
-        level (int): Current level based on experience points
+        created_at (datetime): UTC timestamp when the skill was first gained
+        updated_at (datetime): UTC timestamp when last updated
+        level (int): Current level based on experience points, computed once on creation
     """
 
     character_skill_id: int
@@ -272,6 +280,12 @@ class CharacterSkillData(TimestampMixinDTO):
     activity_id: int
     experience: int
     skill: ActivityData
+    level: int = field(init=False)
+
+    def __post_init__(self):
+        # Explicit base call: zero-argument super() doesn't work in slotted dataclasses.
+        TimestampMixinDTO.__post_init__(self)
+        self.level = xp_to_level(self.experience)
 
     def __str__(self) -> str:
         """Format the skill for display.
@@ -279,16 +293,7 @@ class CharacterSkillData(TimestampMixinDTO):
         Returns:
             str: A string showing the skill name, level, and experience
         """
-        return f"{self.skill.activity_name.title()}: Lvl {self.level} - {self.experience:,}xp"
-
-    @property
-    def level(self) -> int:
-        """Calculate the current level based on total experience points.
-
-        Returns:
-            int: The current level in this skill
-        """
-        return xp_to_level(self.experience)
+        return f"{self.skill.display_name}: Lvl {self.level} - {self.experience:,}xp"
 
     @classmethod
     def from_orm(cls, character_skill: CharacterSkill) -> "CharacterSkillData":
@@ -311,7 +316,7 @@ class CharacterSkillData(TimestampMixinDTO):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterActivityData(TimestampMixinDTO):
     """Data transfer object for CharacterActivity ORM model.
 
@@ -325,14 +330,14 @@ class CharacterActivityData(TimestampMixinDTO):
         activity_option_id (int): ID of the specific action being performed
         activity (ActivityData): Details of the activity being performed
         activity_option (ActivityOptionData): Details of the specific action
-        started_at (pendulum.DateTime): UTC timestamp when the activity was started
+        started_at (datetime): UTC timestamp when the activity was started
     """
 
     character_activity_id: int
     activity_id: int
     character_id: int
     activity_option_id: int
-    started_at: pendulum.DateTime
+    started_at: datetime
     activity: ActivityData
     activity_option: ActivityOptionData
 
@@ -358,8 +363,55 @@ class CharacterActivityData(TimestampMixinDTO):
             updated_at=character_activity.updated_at,
         )
 
+    @classmethod
+    def row_columns(cls) -> tuple[sqlalchemy.ColumnElement, ...]:
+        """Columns from_row reads, all the CharacterActivity's own.
+
+        Select these to read a current activity as a plain row instead of hydrating ORM objects.
 
-@dataclass
+        Returns:
+            tuple[ColumnElement, ...]: Columns to pass to `sqlalchemy.select`
+        """
+        return _CHARACTER_ACTIVITY_ROW_COLUMNS
+
+    @classmethod
+    def from_row(cls, row: sqlalchemy.Row, activity_option: ActivityOptionData) -> "CharacterActivityData":
+        """Convert a row of `row_columns()` to CharacterActivityData.
+
+        Args:
+            row (sqlalchemy.Row): The row to convert
+            activity_option (ActivityOptionData): The option being performed, with its activity
+
+        Returns:
+            CharacterActivityData: A data transfer object representing the activity
+        """
+        return cls(
+            character_activity_id=row.character_activity_id,
+            character_id=row.character_id,
+            activity_id=row.activity_id,
+            activity_option_id=row.activity_option_id,
+            started_at=ensure_utc(row.started_at),
+            activity=activity_option.activity,
+            activity_option=activity_option,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+
+_CHARACTER_TEMPLATE = """\
+            Name: {name}
+            Created: {created} - {created_relative}
+            Current Activity: {current_activity}
+            Skills:
+                {skills}
+            Items:
+                {items}
+            Activity History:
+                {activity_history}
+        """
+
+
+@dataclass(slots=True)
 class CharacterData(TimestampMixinDTO):
     """Data transfer object for Character ORM model.
 
@@ -372,7 +424,7 @@ class CharacterData(TimestampMixinDTO):
         current_activity (Optional[CharacterActivityData]): Current activity if any
         skills (list[CharacterSkillData]): List of character's skills
         items (list[CharacterItemData]): List of items in inventory
-        created_at (pendulum.DateTime): UTC timestamp when character was created
+        created_at (datetime): UTC timestamp when character was created
     """
 
     character_id: int
@@ -391,22 +443,42 @@ class CharacterData(TimestampMixinDTO):
         Returns:
             str: A formatted string representation of the character
         """
-        current_activity_str = (
-            f"{self.current_activity.activity.activity_name.title()} - {self.current_activity.activity_option.activity_option_name}, started {self.current_activity.started_at.diff_for_humans()}"
-            if self.current_activity
-            else "None"
+        current_activity = self.current_activity
+        if current_activity:
+            current_activity_str = (
+                f"{current_activity.activity.display_name} - "
+                f"{current_activity.activity_option.activity_option_name}, "
+                f"started {humanize(current_activity.started_at)}"
+            )
+        else:
+            current_activity_str = "None"
+
+        return _CHARACTER_TEMPLATE.format_map(
+            {
+                "name": self.character_name,
+                "created": self.created_at,
+                "created_relative": humanize(self.created_at),
+                "current_activity": current_activity_str,
+                "skills": "\n\t\t".join(map(str, self.skills)),
+                "items": "\n\t\t".join(map(str, self.items)),
+                "activity_history": "\n\t\t".join(map(str, self.activity_history)),
+            }
         )
-        return f"""\
-            Name: {self.character_name}
-            Created: {self.created_at} - {self.created_at.diff_for_humans()}
-            Current Activity: {current_activity_str}
-            Skills:
-                {"\n\t\t".join([str(skill) for skill in self.skills])}
-            Items:
-                {"\n\t\t".join([str(item) for item in self.items])}
-            Activity History:
-                {"\n\t\t".join([str(activity) for activity in self.activity_history])}
+
+    @classmethod
+    def loader_options(cls) -> tuple[sqlalchemy.orm.interfaces.LoaderOption, ...]:
+        """Loader options that eagerly load everything from_orm reads, in a fixed number of queries.
+
+        Apply these to any query whose results are passed to from_orm. With STRICT_LOADING on, any
+        relationship missing from them raises instead of lazily emitting SQL.
+
+        Returns:
+            tuple[LoaderOption, ...]: Options to pass to `Select.options`
         """
+        options = _CHARACTER_DATA_LOADER_OPTIONS
+        if STRICT_LOADING:
+            options += (sqlalchemy.orm.raiseload("*"),)
+        return options
 
     @classmethod
     def from_orm(cls, character: Character) -> "CharacterData":
@@ -418,12 +490,11 @@ class CharacterData(TimestampMixinDTO):
         Returns:
             CharacterData: A data transfer object representing the character
         """
+        current_activity = character.current_activity
         return cls(
             character_id=character.character_id,
             character_name=character.character_name,
-            current_activity=CharacterActivityData.from_orm(character.current_activity)
-            if character.current_activity
-            else None,
+            current_activity=CharacterActivityData.from_orm(current_activity) if current_activity else None,
             activity_history=[
                 CharacterActivityHistoryData.from_orm(activity) for activity in character.activity_history
             ],
@@ -434,7 +505,92 @@ class CharacterData(TimestampMixinDTO):
         )
 
 
-@dataclass
+# Activities, activity options and items are static reference data, so their DTOs are shared rather than rebuilt
+# for every character that refers to them. The caches are keyed on every column value, so reloaded or changed
+# rows get fresh DTOs; clear_reference_caches() just frees the memory.
+def _activity_key(activity: Activity) -> tuple:
+    return (
+        activity.activity_id,
+        activity.activity_name,
+        activity.activity_type,
+        activity.created_at,
+        activity.updated_at,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_activity_data(
+    activity_id: int, activity_name: str, activity_type: str, created_at: datetime, updated_at: datetime
+) -> ActivityData:
+    return ActivityData(
+        activity_id=activity_id,
+        activity_name=activity_name,
+        activity_type=activity_type,
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_activity_option_data(
+    activity_option_id: int,
+    activity_option_name: str,
+    activity_id: int,
+    action_time: int,
+    created_at: datetime,
+    updated_at: datetime,
+    activity_key: tuple,
+) -> ActivityOptionData:
+    return ActivityOptionData(
+        activity_option_id=activity_option_id,
+        activity_option_name=activity_option_name,
+        activity_id=activity_id,
+        action_time=action_time,
+        activity=_cached_activity_data(*activity_key),
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_item_data(item_id: int, item_name: str, created_at: datetime, updated_at: datetime) -> ItemData:
+    return ItemData(item_id=item_id, item_name=item_name, created_at=created_at, updated_at=updated_at)
+
+
+def clear_reference_caches() -> None:
+    """Drop the shared ActivityData, ActivityOptionData and ItemData instances."""
+    _cached_activity_data.cache_clear()
+    _cached_activity_option_data.cache_clear()
+    _cached_item_data.cache_clear()
+
+
+_CHARACTER_ACTIVITY_ROW_COLUMNS = (
+    CharacterActivity.character_activity_id,
+    CharacterActivity.character_id,
+    CharacterActivity.activity_id,
+    CharacterActivity.activity_option_id,
+    CharacterActivity.started_at,
+    CharacterActivity.created_at,
+    CharacterActivity.updated_at,
+)
+
+_CHARACTER_DATA_LOADER_OPTIONS = (
+    sqlalchemy.orm.selectinload(Character.skills).joinedload(CharacterSkill.skill),
+    sqlalchemy.orm.selectinload(Character.items).joinedload(CharacterItem.item),
+    sqlalchemy.orm.joinedload(Character.current_activity).options(
+        sqlalchemy.orm.joinedload(CharacterActivity.activity),
+        sqlalchemy.orm.joinedload(CharacterActivity.activity_option).joinedload(ActivityOption.activity),
+    ),
+    sqlalchemy.orm.selectinload(Character.activity_history).options(
+        sqlalchemy.orm.joinedload(CharacterActivityHistory.activity_option).joinedload(ActivityOption.activity),
+        sqlalchemy.orm.selectinload(CharacterActivityHistory.item_rewards),
+        sqlalchemy.orm.selectinload(CharacterActivityHistory.experience_rewards),
+        sqlalchemy.orm.selectinload(CharacterActivityHistory.item_costs),
+    ),
+)
+
+
+@dataclass(slots=True)
 class CharacterActivityItemRewardData(TimestampMixinDTO):
     character_activity_item_reward_id: int
     character_activity_history_id: int
@@ -443,17 +599,10 @@ class CharacterActivityItemRewardData(TimestampMixinDTO):
 
     @classmethod
     def from_orm(cls, character_activity_item_reward: CharacterActivityItemReward) -> "CharacterActivityItemReward":
-        return cls(
-            character_activity_item_reward_id=character_activity_item_reward.character_activity_item_reward_id,
-            character_activity_history_id=character_activity_item_reward.character_activity_history_id,
-            item_id=character_activity_item_reward.item_id,
-            quantity=character_activity_item_reward.quantity,
-            created_at=character_activity_item_reward.created_at,
-            updated_at=character_activity_item_reward.updated_at,
-        )
+        return cls(*_FIELD_GETTERS[cls](character_activity_item_reward))
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterActivityExperienceRewardData(TimestampMixinDTO):
     character_activity_experience_reward_id: int
     character_activity_history_id: int
@@ -474,7 +623,7 @@ class CharacterActivityExperienceRewardData(TimestampMixinDTO):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterActivityItemCostData(TimestampMixinDTO):
     character_activity_item_cost_id: int
     character_activity_history_id: int
@@ -483,23 +632,16 @@ class CharacterActivityItemCostData(TimestampMixinDTO):
 
     @classmethod
     def from_orm(cls, character_activity_item_cost: CharacterActivityItemCost) -> "CharacterActivityItemCostData":
-        return cls(
-            character_activity_item_cost_id=character_activity_item_cost.character_activity_item_cost_id,
-            character_activity_history_id=character_activity_item_cost.character_activity_history_id,
-            item_id=character_activity_item_cost.item_id,
-            quantity=character_activity_item_cost.quantity,
-            created_at=character_activity_item_cost.created_at,
-            updated_at=character_activity_item_cost.updated_at,
-        )
+        return cls(*_FIELD_GETTERS[cls](character_activity_item_cost))
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterActivityHistoryData(TimestampMixinDTO):
     character_activity_history_id: int
     character_id: int
     activity_option_id: int
-    started_at: pendulum.DateTime
-    ended_at: pendulum.DateTime
+    started_at: datetime
+    ended_at: datetime
     activity_option: ActivityOptionData
 
     item_rewards: list[CharacterActivityItemRewardData]
@@ -512,8 +654,8 @@ class CharacterActivityHistoryData(TimestampMixinDTO):
             character_activity_history_id=character_activity_history.character_activity_history_id,
             character_id=character_activity_history.character_id,
             activity_option_id=character_activity_history.activity_option_id,
-            started_at=pendulum.instance(character_activity_history.started_at, tz="utc"),
-            ended_at=pendulum.instance(character_activity_history.ended_at, tz="utc"),
+            started_at=ensure_utc(character_activity_history.started_at),
+            ended_at=ensure_utc(character_activity_history.ended_at),
             activity_option=ActivityOptionData.from_orm(character_activity_history.activity_option),
             item_rewards=[
                 CharacterActivityItemRewardData.from_orm(item_reward)
@@ -531,4 +673,30 @@ class CharacterActivityHistoryData(TimestampMixinDTO):
         )
 
     def __str__(self) -> str:
-        return f"{self.activity_option.activity.activity_name.title()} - {self.activity_option.activity_option_name}: Started - {self.started_at}, Ended - {self.ended_at}, Duration: {self.started_at.diff_for_humans(self.ended_at, absolute=True)}"
+        return f"{self.activity_option.activity.display_name} - {self.activity_option.activity_option_name}: Started - {self.started_at}, Ended - {self.ended_at}, Duration: {pendulum.instance(self.started_at).diff_for_humans(pendulum.instance(self.ended_at), absolute=True)}"
+
+
+def _field_getter(dto_cls: type) -> operator.attrgetter:
+    """Build a getter returning a DTO's init fields, in order, from an ORM model with matching attribute names.
+
+    attrgetter does all the lookups in C, so `cls(*getter(orm))` skips a Python-level keyword per field.
+
+    Args:
+        dto_cls (type): A dataclass DTO whose init fields are all attributes of its ORM model
+
+    Returns:
+        operator.attrgetter: A callable returning the field values as a tuple
+    """
+    return operator.attrgetter(*(f.name for f in fields(dto_cls) if f.init))
+
+
+# Converters for the DTOs that are a straight copy of their ORM model's columns.
+_FIELD_GETTERS: dict[type, operator.attrgetter] = {
+    dto_cls: _field_getter(dto_cls)
+    for dto_cls in (
+        ActivityOptionItemCostData,
+        ActivityOptionSkillRequirementData,
+        CharacterActivityItemRewardData,
+        CharacterActivityItemCostData,
+    )
+}
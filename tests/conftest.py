@@ -0,0 +1,80 @@
+import pytest
+import sqlalchemy
+import sqlalchemy.orm
+
+from idlemax.game import Game
+from idlemax.game_data import CharacterData
+
+
+@pytest.fixture(scope="session")
+def game_database():
+    """One Game and schema shared by every test, without the static data (see seed_baseline).
+
+    The database is in memory. StaticPool keeps it on a single connection, which is the only way sessions can
+    share it. `autocommit=False` gives pysqlite the transaction handling SAVEPOINT needs.
+    """
+    game = Game(
+        "sqlite://",
+        load_game_data=False,
+        poolclass=sqlalchemy.pool.StaticPool,
+        connect_args={"check_same_thread": False, "autocommit": False},
+    )
+    yield game
+    game.engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def tables(game_database: Game) -> set[str]:
+    """Names of the tables in the shared database, inspected once."""
+    return set(sqlalchemy.inspect(game_database.engine).get_table_names())
+
+
+@pytest.fixture(scope="session")
+def seed_baseline(game_database: Game) -> None:
+    """Load the static game data once. It's committed, so every test's rollback leaves it in place."""
+    game_database.load_game_data()
+
+
+@pytest.fixture(scope="function")
+def game(game_database: Game, seed_baseline: None, monkeypatch: pytest.MonkeyPatch):
+    """The shared Game, inside a transaction that's rolled back after the test.
+
+    The game's sessions join the transaction with a SAVEPOINT, so their commits and rollbacks stay inside it.
+    """
+    with game_database.engine.connect() as connection, connection.begin() as transaction:
+        monkeypatch.setattr(
+            game_database,
+            "sessionmaker",
+            sqlalchemy.orm.sessionmaker(bind=connection, join_transaction_mode="create_savepoint"),
+        )
+        yield game_database
+        transaction.rollback()
+
+
+@pytest.fixture(scope="function")
+def alice(game: Game) -> CharacterData:
+    """A new character named Alice, rolled back with the rest of the test."""
+    return game.create_character("Alice")
+
+
+@pytest.fixture(scope="function")
+def bob(game: Game) -> CharacterData:
+    """A new character named Bob, rolled back with the rest of the test."""
+    return game.create_character("Bob")
+
+
+@pytest.fixture(scope="function")
+def statements(game: Game):
+    """SQL statements the game executes during the test, leaving out the fixture's own SAVEPOINTs.
+
+    The listener is removed afterwards, so it doesn't outlive the test on the shared engine.
+    """
+    executed: list[str] = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        if "SAVEPOINT" not in statement:
+            executed.append(statement)
+
+    sqlalchemy.event.listen(game.engine, "before_cursor_execute", record)
+    yield executed
+    sqlalchemy.event.remove(game.engine, "before_cursor_execute", record)
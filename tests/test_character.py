@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from idlemax.character import ensure_utc, humanize
+
+
+@pytest.mark.parametrize(
+    "offset, expected",
+    [
+        (timedelta(seconds=3), "a few seconds ago"),
+        (timedelta(seconds=45), "45 seconds ago"),
+        (timedelta(minutes=1, seconds=30), "1 minute ago"),
+        (timedelta(hours=5), "5 hours ago"),
+        (timedelta(days=2), "2 days ago"),
+        (timedelta(weeks=3), "3 weeks ago"),
+        (timedelta(days=28), "4 weeks ago"),
+        (timedelta(days=30), "1 month ago"),
+        (timedelta(days=340), "11 months ago"),
+        (timedelta(days=365), "1 year ago"),
+        (timedelta(days=400), "1 year ago"),
+        (-timedelta(hours=2, seconds=5), "in 2 hours"),
+    ],
+)
+def test_humanize(offset: timedelta, expected: str):
+    assert humanize(datetime.now(timezone.utc) - offset) == expected
+
+
+def test_humanize_naive_is_utc():
+    naive = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=10)
+    assert humanize(naive) == "10 minutes ago"
+
+
+def test_ensure_utc_naive():
+    naive = datetime(2025, 1, 2, 3, 4, 5, 6)
+    converted = ensure_utc(naive)
+    assert converted == datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+    assert converted.tzinfo is timezone.utc
+
+
+def test_ensure_utc_aware():
+    aware = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+    converted = ensure_utc(aware)
+    assert converted == aware
+    assert converted.tzinfo is timezone.utc
+    assert ensure_utc(None) is None
@@ -0,0 +1,19 @@
+import pytest
+
+from idlemax.experience_to_level import xp_to_level
+
+
+@pytest.mark.parametrize(
+    "experience, level",
+    [
+        (0, 1),
+        (82, 1),
+        (83, 2),
+        (174, 3),
+        (1_154, 10),
+        (68_023, 60),
+        (1_000_000_000, 99),
+    ],
+)
+def test_xp_to_level(experience: int, level: int):
+    assert xp_to_level(experience) == level
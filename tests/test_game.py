@@ -1,33 +1,52 @@
-import os
+import dataclasses
 
+import pendulum
 import pytest
 import sqlalchemy
+import sqlalchemy.orm
 
+import idlemax.game_data
+from idlemax.character import Character, CharacterActivity
 from idlemax.game import Game
+from idlemax.game_data import CharacterData
 
-TEST_DB_PATH = "test-game.db"
 
-
-@pytest.fixture(scope="function")
-def game():
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
-    yield Game(f"sqlite:///{TEST_DB_PATH}")
-
-
-def test_init_db(game: Game):
-    inspector = sqlalchemy.inspect(game.engine)
-    tables = inspector.get_table_names()
+def test_init_db(game_database: Game, tables: set[str]):
     expected_tables = {"characters", "activities", "character_activities"}
     for table in expected_tables:
         assert table in tables, f"Table '{table}' does not exist"
 
+    character_item_indexes = {
+        index["name"] for index in sqlalchemy.inspect(game_database.engine).get_indexes("character_items")
+    }
+    assert "ix_character_items_character_id_item_id" in character_item_indexes
+
+
+def test_skip_loading_game_data(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    # Needs a committed database to reopen, so doesn't use the shared one.
+    db_filepath = f"sqlite:///{tmp_path / 'game.db'}"
+    Game(db_filepath).create_character(character_name="Tobyone")
+    reopened = Game(db_filepath, load_game_data=False)
+    assert reopened.get_activity_by_name("mining").activity_id == 1
+    assert reopened.get_character_by_name("Tobyone").character_name == "Tobyone"
+
+    # The data's already there, so it isn't reloaded unless asked for.
+    def fail_to_load(game: Game):
+        raise AssertionError("Reloaded the game data")
+
+    monkeypatch.setattr(Game, "load_game_data", fail_to_load)
+    assert Game(db_filepath).get_activity_by_name("mining").activity_id == 1
+    with pytest.raises(AssertionError):
+        Game(db_filepath, load_game_data=True)
+
 
 def test_create_character(game: Game):
-    game.create_character(character_name="Tobyone")
-    char = game.get_character_by_name("Tobyone")
-    assert char is not None
+    char = game.create_character(character_name="Tobyone")
     assert char.character_name == "Tobyone"
+    assert {skill.skill.activity_name for skill in char.skills} == {
+        activity.activity_name for activity in game.get_all_activities() if activity.activity_type == "skill"
+    }
+    assert all(skill.experience == 0 for skill in char.skills)
 
 
 def test_get_activity_by_name(game: Game):
@@ -36,12 +55,25 @@ def test_get_activity_by_name(game: Game):
     assert activity.activity_type == "skill"
     assert activity.activity_id == 1
 
+    with pytest.raises(sqlalchemy.exc.NoResultFound):
+        game.get_activity_by_name("juggling")
+
+
+def test_get_all_activities(game: Game):
+    activity_names = [activity.activity_name for activity in game.get_all_activities()]
+    assert activity_names[:2] == ["mining", "woodcutting"]
+
+
+def test_get_all_activity_options(game: Game):
+    mining_options = game.get_all_activity_options("mining")
+    assert [option.activity_option_name for option in mining_options] == ["coal", "iron", "copper", "tin"]
+    assert all(option.activity is game.get_activity_by_name("mining") for option in mining_options)
+
 
 def test_start_activity(game: Game):
     game.create_character(character_name="Tobyone")
     game.start_activity(character_name="Tobyone", activity_name="mining", activity_option_name="copper")
     current_activity = game.get_current_activity(character_name="Tobyone")
-    print(current_activity)
     assert current_activity.activity_id == 1
     assert current_activity.started_at is not None
 
@@ -53,27 +85,79 @@ def test_start_activity(game: Game):
     assert current_activity.started_at is not None
 
 
-def test_stop_current_activity(game: Game):
+def test_get_current_activity_is_one_statement(game: Game, statements: list[str]):
     game.create_character(character_name="Tobyone")
     game.start_activity(character_name="Tobyone", activity_name="mining", activity_option_name="copper")
-    game.stop_current_activity(character_name="Tobyone")
+    statements.clear()
     current_activity = game.get_current_activity(character_name="Tobyone")
-    assert current_activity is None
+    assert len(statements) == 1
+    assert current_activity.activity.activity_name == "mining"
+    assert current_activity.activity_option.activity_option_name == "copper"
+    assert current_activity.activity_option.activity is current_activity.activity
+    assert current_activity.activity_option is game.get_all_activity_options("mining")[2]
+
+    with pytest.raises(sqlalchemy.exc.NoResultFound):
+        game.get_current_activity(character_name="Nobody")
+
+
+def test_start_activity_checks_requirements(game: Game, bob: CharacterData):
+    with pytest.raises(sqlalchemy.exc.NoResultFound):
+        game.start_activity(character_name="Bob", activity_name="mining", activity_option_name="gold")
+    # Coal needs level 30 mining.
+    with pytest.raises(ValueError):
+        game.start_activity(character_name="Bob", activity_name="mining", activity_option_name="coal")
+    # Bronze bars cost copper and tin.
+    with pytest.raises(ValueError):
+        game.start_activity(character_name="Bob", activity_name="smithing", activity_option_name="bronze bar")
+    assert game.get_current_activity(character_name="Bob") is None
+
+    game.give_character_skill_xp("Bob", "mining", 13_363)  # Level 30
+    game.start_activity(character_name="Bob", activity_name="mining", activity_option_name="coal")
+    assert game.get_current_activity(character_name="Bob").activity_option.activity_option_name == "coal"
+
+
+def test_start_activity_does_not_lazy_load_the_activity(game: Game, statements: list[str]):
+    game.create_character(character_name="Tobyone")
+    statements.clear()
+    started = game.start_activity(character_name="Tobyone", activity_name="mining", activity_option_name="copper")
+    assert started.activity.activity_name == "mining"
+    assert not [statement for statement in statements if statement.startswith("SELECT activities.")]
+
+
+def test_one_current_activity_per_character(game: Game):
+    character = game.create_character(character_name="Tobyone")
+    game.start_activity(character_name="Tobyone", activity_name="mining", activity_option_name="copper")
+    with game.sessionmaker() as session:
+        session.add(CharacterActivity(character_id=character.character_id, activity_id=2, activity_option_id=3))
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            session.flush()
+
+
+def test_stop_current_activity(game: Game):
+    game.create_character(character_name="Tobyone")
+    started = game.start_activity(character_name="Tobyone", activity_name="mining", activity_option_name="copper")
+    ended = game.stop_current_activity(character_name="Tobyone")
+    assert ended.activity_option.activity_option_name == "copper"
+    assert ended.started_at == started.started_at
+    assert ended.ended_at >= ended.started_at
+    copper = game.get_character_item_by_name("Tobyone", "copper")
+    assert [item_reward.item_id for item_reward in ended.item_rewards] == [copper.item_id]
+    # Nothing left to stop.
+    assert game.stop_current_activity(character_name="Tobyone") is None
 
 
-def test_multiple_characters(game: Game):
-    game.create_character(character_name="Alice")
-    game.create_character(character_name="Bob")
-    alice = game.get_character_by_name("Alice")
-    bob = game.get_character_by_name("Bob")
+def test_multiple_characters(game: Game, alice: CharacterData, bob: CharacterData):
     assert alice.character_name == "Alice"
     assert bob.character_name == "Bob"
     assert alice.character_id != bob.character_id
 
+    assert game.get_all_character_names() == ["Alice", "Bob"]
+    summaries = game.get_all_character_summaries()
+    assert [character_name for character_name, _ in summaries] == ["Alice", "Bob"]
+    assert summaries[0][1] == alice.created_at
+
 
-def test_start_and_stop_activity_multiple_characters(game: Game):
-    game.create_character(character_name="Alice")
-    game.create_character(character_name="Bob")
+def test_start_and_stop_activity_multiple_characters(game: Game, alice: CharacterData, bob: CharacterData):
     game.start_activity(character_name="Alice", activity_name="mining", activity_option_name="copper")
     game.start_activity(character_name="Bob", activity_name="woodcutting", activity_option_name="tree")
     alice_activity = game.get_current_activity(character_name="Alice")
@@ -85,32 +169,44 @@ def test_start_and_stop_activity_multiple_characters(game: Game):
     assert game.get_current_activity(character_name="Bob") is not None
 
 
-def test_reward_experience_and_items(game: Game):
-    game.create_character(character_name="Alice")
+def test_reward_experience_and_items(game: Game, alice: CharacterData):
     game.start_activity(character_name="Alice", activity_name="mining", activity_option_name="copper")
     # Simulate time passing by stopping the activity
     game.stop_current_activity(character_name="Alice")
-    char = game.get_character_by_name("Alice")
     # Check that Alice has some experience in mining
-    mining_skill = next((s for s in char.skills if s.skill.activity_name == "mining"), None)
-    assert mining_skill is not None
+    mining_skill = game.get_character_skill_by_name("Alice", "mining")
+    assert mining_skill.skill.activity_name == "mining"
     assert mining_skill.experience >= 0
-    # Check that Alice has the reward item (iron)
-    copper_item = next((item for item in char.items if item.item.item_name == "copper"), None)
-    assert copper_item is not None
-    assert copper_item.item is not None
+    # Check that Alice has the reward item (copper). get_character_item_by_name would create it, so check the
+    # inventory first.
+    assert "copper" in {item.item.item_name for item in game.get_character_by_name("Alice").items}
+    copper_item = game.get_character_item_by_name("Alice", "copper")
     assert copper_item.item.item_name == "copper"
     assert copper_item.character_item_id is not None
 
 
-def test_give_items(game: Game):
+def test_item_costs_are_consumed(game: Game, bob: CharacterData, monkeypatch: pytest.MonkeyPatch):
+    game.add_item_to_character("Bob", "copper", 5)
+    game.add_item_to_character("Bob", "tin", 2)
+    game.start_activity(character_name="Bob", activity_name="smithing", activity_option_name="bronze bar")
+    # Long enough for 3 bars, but there's only tin for 2.
+    ended_at = pendulum.now("utc").add(seconds=3, microseconds=500_000)
+    monkeypatch.setattr(pendulum, "now", lambda tz=None: ended_at)
+    game.stop_current_activity(character_name="Bob")
+
+    assert game.get_character_item_by_name("Bob", "copper").quantity == 3
+    assert game.get_character_item_by_name("Bob", "tin").quantity == 0
+    assert game.get_character_item_by_name("Bob", "bronze bar").quantity == 2
+    assert game.get_character_skill_by_name("Bob", "smithing").experience == 2 * 10
+
+
+def test_give_items(game: Game, bob: CharacterData):
     """
     1. Create Bob
     2. Give Bob 1 iron
     3. Assert Bob has 1 iron
     4. Assert Bob has 0 coal
     """
-    bob = game.create_character("Bob")
     game.add_item_to_character("Bob", "iron", 1)
     bobs_iron = game.get_character_item_by_name("Bob", "iron")
     assert bobs_iron.item.item_name == "iron"
@@ -120,8 +216,11 @@ def test_give_items(game: Game):
     assert bobs_coal.item.item_name == "coal"
     assert bobs_coal.quantity == 0
 
+    with pytest.raises(sqlalchemy.exc.NoResultFound):
+        game.add_item_to_character("Bob", "unobtainium", 1)
 
-def test_give_character_skills(game: Game):
+
+def test_give_character_skills(game: Game, bob: CharacterData):
     """
     1. Create Bob
     2. Give Bob level 15 mining.
@@ -130,7 +229,6 @@ def test_give_character_skills(game: Game):
     5. Give Bob xp to get to level 60.
     6. Assert that Bob has the right xp and level.
     """
-    game.create_character("Bob")
     game.give_character_skill_xp("Bob", "mining", 1_154)
     bobs_mining = game.get_character_skill_by_name("Bob", "mining")
     assert bobs_mining.experience == 1_154
@@ -140,3 +238,60 @@ def test_give_character_skills(game: Game):
     bobs_mining = game.get_character_skill_by_name("Bob", "mining")
     assert bobs_mining.experience == 68_023
     assert bobs_mining.level == 60
+
+
+def test_get_character_query_count_is_constant(game: Game, bob: CharacterData, statements: list[str]):
+    """Loading a character shouldn't issue a query per item, skill, or past activity."""
+    game.add_item_to_character("Bob", "coal", 1)
+    game.start_activity(character_name="Bob", activity_name="mining", activity_option_name="copper")
+    game.stop_current_activity(character_name="Bob")
+
+    statements.clear()
+    game.get_character_by_name("Bob")
+    small_character_queries = len(statements)
+
+    for item_name in ("iron", "log", "shrimp"):
+        game.add_item_to_character("Bob", item_name, 1)
+    game.start_activity(character_name="Bob", activity_name="woodcutting", activity_option_name="tree")
+    game.stop_current_activity(character_name="Bob")
+    statements.clear()
+
+    game.get_character_by_name("Bob")
+    assert len(statements) == small_character_queries
+
+
+@pytest.mark.parametrize("strict_loading", [True, False])
+def test_strict_loading(game: Game, bob: CharacterData, monkeypatch: pytest.MonkeyPatch, strict_loading: bool):
+    monkeypatch.setattr(idlemax.game_data, "STRICT_LOADING", strict_loading)
+    game.start_activity(character_name="Bob", activity_name="mining", activity_option_name="copper")
+    with game.sessionmaker() as session:
+        character = session.execute(sqlalchemy.select(Character).options(*CharacterData.loader_options())).scalar_one()
+        CharacterData.from_orm(character)
+
+        # Not part of CharacterData, so not eagerly loaded.
+        if strict_loading:
+            with pytest.raises(sqlalchemy.exc.InvalidRequestError):
+                character.current_activity.activity_option.skill_requirements
+        else:
+            assert character.current_activity.activity_option.skill_requirements is not None
+
+
+def test_reference_data_is_shared(game: Game, alice: CharacterData, bob: CharacterData):
+    assert alice.skills[0].skill is bob.skills[0].skill
+    assert game.get_all_characters()[1].skills[0].skill is alice.skills[0].skill
+    assert alice.skills[0].skill is game.get_activity_by_name(alice.skills[0].skill.activity_name)
+
+    idlemax.game_data.clear_reference_caches()
+    assert game.get_character_by_name("Alice").skills[0].skill is not alice.skills[0].skill
+    assert game.get_character_by_name("Alice").skills[0].skill == alice.skills[0].skill
+
+
+def test_reference_data_is_frozen(game: Game, alice: CharacterData, bob: CharacterData):
+    # Shared by every character and by Game's own caches, so a change through one would show up in all of them.
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        alice.skills[0].skill.activity_name = "HACKED"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        game.get_all_activity_options("mining")[0].action_time = 0
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        game.get_character_item_by_name("Bob", "copper").item.item_name = "HACKED"
+    assert game.get_character_by_name("Bob").skills[0].skill.activity_name == alice.skills[0].skill.activity_name